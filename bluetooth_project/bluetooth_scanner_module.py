@@ -23,23 +23,117 @@ How it works:
 # IMPORTS
 # ============================================================================
 import asyncio
-from typing import Optional
+import io
+import math
+import sys
+import time
+from typing import Dict, Iterable, Optional, Tuple
 from bleak import BleakScanner
 from bleak.exc import BleakError
 import config_module as config
 
+# Sentinel RSSI for "not seen"; below any real reading, so it compares as far
+RSSI_MISSING: int = -32768
+
+# ============================================================================
+# BACKEND OPTIONS
+# ============================================================================
+
+
+def _scanner_kwargs() -> dict:
+    """
+    Backend-specific BleakScanner options.
+
+    Active scanning requests scan responses as well, so an advertiser is
+    typically caught in its first slot. On BlueZ discovery is restricted to
+    LE, with duplicate reports kept so RSSI keeps updating for an
+    already-seen device.
+    """
+    kwargs = {"scanning_mode": "active"}
+    if sys.platform.startswith("linux"):
+        kwargs["bluez"] = {"filters": {"Transport": "le", "DuplicateData": True}}
+    return kwargs
+
+
+# ============================================================================
+# CONTINUOUS SCAN BASE
+# ============================================================================
+
+
+class _ContinuousScanner:
+    """
+    Owns a long-lived BleakScanner that feeds _on_advertisement.
+
+    Subclasses set stale_timeout, implement _on_advertisement and may extend
+    _on_scan_start / _on_scan_stop to reset or release their own state.
+    """
+
+    stale_timeout: float
+    _scanner: Optional[BleakScanner] = None
+    _started_at: float = -math.inf
+
+    async def start(self) -> None:
+        """
+        Start the long-lived scanner if it is not running yet.
+
+        Raises:
+            BleakError: If Bluetooth adapter is unavailable
+        """
+        if self._scanner is not None:
+            return
+        self._on_scan_start()
+        scanner = BleakScanner(
+            detection_callback=self._on_advertisement, **_scanner_kwargs())
+        await scanner.start()
+        self._scanner = scanner
+        self._started_at = time.monotonic()
+
+    async def stop(self) -> None:
+        """Stop the long-lived scanner if it is running."""
+        scanner, self._scanner = self._scanner, None
+        self._on_scan_stop()
+        if scanner is not None:
+            try:
+                await scanner.stop()
+            except Exception as e:
+                print(f"[ERROR] Failed to stop scanner: {e}")
+
+    @property
+    def is_running(self) -> bool:
+        """True while the long-lived scanner is active."""
+        return self._scanner is not None
+
+    def _in_startup_window(self) -> bool:
+        """True until the scan has run for stale_timeout, the longest gap
+        between readings that still counts as detected."""
+        return time.monotonic() - self._started_at < self.stale_timeout
+
+    def _on_scan_start(self) -> None:
+        """Hook run before the scanner starts."""
+
+    def _on_scan_stop(self) -> None:
+        """Hook run when the scanner is stopped."""
+
+    def _on_advertisement(self, device, advertisement_data) -> None:
+        raise NotImplementedError
+
+
 # ============================================================================
 # BLUETOOTH SCANNER CLASS
 # ============================================================================
 
 
-class BluetoothScanner:
+class BluetoothScanner(_ContinuousScanner):
     """
     Manages Bluetooth scanning operations for proximity detection.
 
     Attributes:
         target_mac (str): MAC address of the device to monitor
         scan_timeout (float): Timeout duration for each scan
+        stale_timeout (float): Age after which a continuous-scan reading expires
+        adv_event (asyncio.Event): Set when the smoothed continuous-scan
+            reading crosses a lock/unlock threshold, the device reappears,
+            or its reading goes stale
     """
 
     def __init__(self, target_mac: str, scan_timeout: float = config.SCAN_TIMEOUT):
@@ -51,16 +145,123 @@ class BluetoothScanner:
             scan_timeout: Maximum time to wait during each scan
         """
         self.target_mac = target_mac.lower()
+        # Backends report addresses upper-case; accept either case without
+        # lowering every advertisement's address
+        self._target_addresses = frozenset(
+            (self.target_mac, self.target_mac.upper()))
         self.scan_timeout = scan_timeout
-        self._last_rssi = None
+        self.stale_timeout = config.MAX_STALE_S
+        self._last_rssi = RSSI_MISSING
+        # -inf so "never seen" is stale however long the machine has been up
+        self._last_seen = -math.inf
+        # Moving average over every advertisement of the continuous scan
+        self._ema_alpha = config.RSSI_EMA_ALPHA
+        self._ema = float(RSSI_MISSING)
+        self._scanner: Optional[BleakScanner] = None
+        self._stale_timer: Optional[asyncio.TimerHandle] = None
+        self.adv_event = asyncio.Event()
+
+    # ------------------------------------------------------------------------
+    # CONTINUOUS SCANNING
+    # ------------------------------------------------------------------------
+    # While running, get_rssi() returns the cached reading instead of
+    # powering the adapter up and down for every scan
+    def _on_scan_start(self) -> None:
+        self.adv_event.clear()
+
+    def _on_scan_stop(self) -> None:
+        if self._stale_timer is not None:
+            self._stale_timer.cancel()
+            self._stale_timer = None
+
+    def _on_advertisement(self, device, advertisement_data) -> None:
+        """Detection callback: fold each advertisement of the target into the average."""
+        if device.address in self._target_addresses:
+            rssi = advertisement_data.rssi
+            now = time.monotonic()
+            prev = self._ema
+            if now - self._last_seen >= self.stale_timeout:
+                # First sighting or reappearance: restart the average
+                ema = float(rssi)
+                self.adv_event.set()
+            else:
+                alpha = self._ema_alpha
+                ema = alpha * rssi + (1.0 - alpha) * prev
+                if self._crosses_threshold(prev, ema):
+                    self.adv_event.set()
+            self._ema = ema
+            self._last_rssi = rssi
+            self._last_seen = now
+            if self._stale_timer is None:
+                self._arm_stale_timer(self.stale_timeout)
+
+    def _arm_stale_timer(self, delay: float) -> None:
+        self._stale_timer = asyncio.get_running_loop().call_later(
+            delay, self._on_stale_timer)
+
+    def _on_stale_timer(self) -> None:
+        """Set adv_event once the latest reading expires, so a silent device is noticed.
+
+        The timer is armed once rather than per advertisement; if newer
+        advertisements arrived meanwhile it re-arms for the remaining time.
+        """
+        remaining = self._last_seen + self.stale_timeout - time.monotonic()
+        if remaining > 0:
+            self._arm_stale_timer(remaining)
+        else:
+            self._stale_timer = None
+            self.adv_event.set()
+
+    @staticmethod
+    def _crosses_threshold(prev: float, rssi: float) -> bool:
+        """True if moving from prev to rssi crosses a lock/unlock threshold."""
+        return ((prev < config.LOCK_THRESHOLD) != (rssi < config.LOCK_THRESHOLD)
+                or (prev > config.UNLOCK_THRESHOLD) != (rssi > config.UNLOCK_THRESHOLD))
+
+    @property
+    def awaiting_first_reading(self) -> bool:
+        """True if the scan started recently and the target has not advertised
+        since; a missing reading then means "not known yet", not a miss."""
+        return self._last_seen < self._started_at and self._in_startup_window()
 
     # ------------------------------------------------------------------------
     # MAIN SCAN METHOD
     # ------------------------------------------------------------------------
     async def get_rssi(self) -> Optional[int]:
+        """
+        Retrieve RSSI of target device.
+
+        If the continuous scanner is running this is a cached read of the
+        moving average over its advertisements; otherwise a one-shot scan
+        is performed and the raw reading returned.
+
+        Returns:
+            int: RSSI value if device found (typically -30 to -100)
+            None: If device not found, reading is stale, or scan failed
+
+        Raises:
+            BleakError: If Bluetooth adapter is unavailable
+        """
+        if self._scanner is None:
+            return await self._scan_once()
+
+        if time.monotonic() - self._last_seen < self.stale_timeout:
+            rssi = round(self._ema)
+            if config.VERBOSE_LOGGING:
+                print(f"[SCAN] Device in range | RSSI: {rssi}")
+            return rssi
+
+        if config.VERBOSE_LOGGING:
+            print(f"[SCAN] Target device {self.target_mac} not detected")
+        return None
+
+    async def _scan_once(self) -> Optional[int]:
         """
         Scan for nearby Bluetooth devices and retrieve RSSI of target device.
 
+        The scan stops as soon as the target advertises, so the call only
+        blocks for the full scan_timeout when the device is out of range.
+
         Returns:
             int: RSSI value if device found (typically -30 to -100)
             None: If device not found or scan failed
@@ -68,18 +269,35 @@ class BluetoothScanner:
         Raises:
             BleakError: If Bluetooth adapter is unavailable
         """
+        found = asyncio.Event()
+        result = {}
+
+        def _on_advertisement(device, advertisement_data):
+            # Match by MAC address (case-insensitive) and stop waiting
+            if device.address in self._target_addresses:
+                result["name"] = device.name
+                result["rssi"] = advertisement_data.rssi
+                found.set()
+
         try:
-            # Discover nearby BLE devices
-            devices = await BleakScanner.discover(timeout=self.scan_timeout)
-
-            for device in devices:
-                # Match by MAC address (case-insensitive)
-                if device.address.lower() == self.target_mac:
-                    self._last_rssi = device.rssi
-                    if config.VERBOSE_LOGGING:
-                        print(
-                            f"[SCAN] Device found: {device.name or 'Unknown'} | RSSI: {device.rssi}")
-                    return device.rssi
+            # Scan until the target advertises or the timeout elapses
+            scanner = BleakScanner(
+                detection_callback=_on_advertisement, **_scanner_kwargs())
+            await scanner.start()
+            try:
+                await asyncio.wait_for(found.wait(), timeout=self.scan_timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await scanner.stop()
+
+            rssi = result.get("rssi")
+            if rssi is not None:
+                self._last_rssi = rssi
+                if config.VERBOSE_LOGGING:
+                    print(
+                        f"[SCAN] Device found: {result.get('name') or 'Unknown'} | RSSI: {rssi}")
+                return rssi
 
             # If not found
             if config.VERBOSE_LOGGING:
@@ -98,25 +316,102 @@ class BluetoothScanner:
     # ------------------------------------------------------------------------
     @property
     def last_rssi(self) -> Optional[int]:
-        """Returns the last successfully retrieved RSSI value."""
-        return self._last_rssi
+        """Returns the last successfully retrieved RSSI value (None if never seen)."""
+        rssi = self._last_rssi
+        return None if rssi == RSSI_MISSING else rssi
 
-    def is_device_nearby(self, rssi: Optional[int], threshold: int) -> bool:
+    def is_device_nearby(self, rssi: int, threshold: int) -> bool:
         """
         Check if device is nearby based on RSSI threshold.
 
         Args:
-            rssi: Current RSSI value (None if not detected)
+            rssi: Current RSSI value (RSSI_MISSING if not detected)
             threshold: RSSI threshold (e.g., -70)
 
         Returns:
             bool: True if RSSI > threshold, False otherwise
         """
-        if rssi is None:
-            return False
         return rssi > threshold
 
 
+class MultiDeviceScanner(_ContinuousScanner):
+    """
+    Single continuous BLE scan tracking the smoothed RSSI of several devices.
+
+    One hardware scan session feeds every target instead of running one
+    scanner per device; each advertisement is matched with one dict lookup.
+
+    Attributes:
+        stale_timeout (float): Age after which a reading expires
+    """
+
+    def __init__(self, target_macs: Iterable[str], stale_timeout: float = config.MAX_STALE_S,
+                 ema_alpha: float = config.RSSI_EMA_ALPHA):
+        """
+        Initialize the shared scanner.
+
+        Args:
+            target_macs: Bluetooth MAC addresses to monitor
+            stale_timeout: Seconds after which a reading counts as not detected
+            ema_alpha: Weight of each advertisement in the RSSI moving average
+        """
+        self.stale_timeout = stale_timeout
+        self._ema_alpha = ema_alpha
+        # Advertised address (either case) -> normalized lower-case MAC
+        self._targets: Dict[str, str] = {}
+        for mac in target_macs:
+            mac = mac.lower()
+            self._targets[mac] = mac
+            self._targets[mac.upper()] = mac
+        # Normalized MAC -> (smoothed RSSI, monotonic time seen)
+        self._latest: Dict[str, Tuple[float, float]] = {}
+        self._scanner: Optional[BleakScanner] = None
+
+    def _on_advertisement(self, device, advertisement_data) -> None:
+        """Detection callback: fold each target advertisement into its average."""
+        mac = self._targets.get(device.address)
+        if mac is not None:
+            rssi = advertisement_data.rssi
+            now = time.monotonic()
+            prev = self._latest.get(mac)
+            # A first sighting or reappearance restarts the average
+            if prev is not None and now - prev[1] < self.stale_timeout:
+                alpha = self._ema_alpha
+                rssi = alpha * rssi + (1.0 - alpha) * prev[0]
+            self._latest[mac] = (rssi, now)
+
+    def awaiting_first_reading(self, mac: str) -> bool:
+        """
+        Check whether a device has simply not been heard yet.
+
+        Args:
+            mac: Bluetooth MAC address of the device
+
+        Returns:
+            bool: True if the scan started recently and the device has not
+            advertised since, so a missing reading is not yet a miss
+        """
+        reading = self._latest.get(mac.lower())
+        return ((reading is None or reading[1] < self._started_at)
+                and self._in_startup_window())
+
+    def get_rssi(self, mac: str) -> Optional[int]:
+        """
+        Return the smoothed RSSI of a target device.
+
+        Args:
+            mac: Bluetooth MAC address of the device
+
+        Returns:
+            int: RSSI value if a fresh reading exists
+            None: If never seen or the last reading is stale
+        """
+        reading = self._latest.get(mac.lower())
+        if reading is None or time.monotonic() - reading[1] >= self.stale_timeout:
+            return None
+        return round(reading[0])
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -149,11 +444,16 @@ async def list_nearby_devices():
             print("No devices found. Ensure Bluetooth is enabled.")
             return
 
+        # Build the report first and emit it with a single write
+        buf = io.StringIO()
+        separator = "-" * 60 + "\n"
         for device in devices:
-            print(f"Name: {device.name or 'Unknown'}")
-            print(f"Address: {device.address}")
-            print(f"RSSI: {device.rssi} dBm")
-            print("-" * 60)
+            buf.write(f"Name: {device.name or 'Unknown'}\n")
+            buf.write(f"Address: {device.address}\n")
+            buf.write(f"RSSI: {device.rssi} dBm\n")
+            buf.write(separator)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
     except Exception as e:
         print(f"[ERROR] Diagnostic scan failed: {e}")
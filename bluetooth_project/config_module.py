@@ -32,11 +32,17 @@ LOCK_THRESHOLD: int = -80       # Lock system when RSSI drops below this
 UNLOCK_THRESHOLD: int = -70     # Unlock when RSSI rises above this
 # Note: UNLOCK_THRESHOLD must be greater than LOCK_THRESHOLD to avoid flapping
 
+# Hysteresis margins (multi-device mode): a lock/unlock needs the smoothed
+# RSSI to pass its threshold by this many extra dB
+LOCK_MARGIN: int = 2            # Lock below LOCK_THRESHOLD - LOCK_MARGIN
+UNLOCK_MARGIN: int = 4          # Unlock above UNLOCK_THRESHOLD + UNLOCK_MARGIN
+
 # ============================================================================
 # TIMING CONFIGURATION
 # ============================================================================
 SCAN_INTERVAL: float = 5.0      # Seconds between scans
-SCAN_TIMEOUT: float = 3.0       # Seconds to wait for each BLE discovery
+SCAN_TIMEOUT: float = 3.0       # Max seconds to wait for the target to advertise
+MAX_STALE_S: float = 10.0       # Seconds before a continuous-scan RSSI expires
 
 # ============================================================================
 # LOGGING CONFIGURATION
@@ -44,16 +50,37 @@ SCAN_TIMEOUT: float = 3.0       # Seconds to wait for each BLE discovery
 LOG_DIR: Path = Path(__file__).parent / "logs"
 LOG_FILE: Path = LOG_DIR / "activity_log.txt"
 VERBOSE_LOGGING: bool = True    # Enables console output for debugging
+RSSI_LOG_DELTA: int = 3         # dB change needed before RSSI is logged again
 
 # ============================================================================
 # ADVANCED SETTINGS
 # ============================================================================
 CONSECUTIVE_FAIL_THRESHOLD: int = 2  # Failures before locking system
+RSSI_EMA_ALPHA: float = 0.3          # Weight of newest RSSI in moving average
 SYSTEM_COMMAND_RETRIES: int = 3      # Retry count for system commands
 
 # ============================================================================
 # VALIDATION FUNCTION
 # ============================================================================
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+_MAC_COLON_POSITIONS = (2, 5, 8, 11, 14)
+_MAC_HEX_POSITIONS = (0, 1, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16)
+
+
+def _is_mac(value: str) -> bool:
+    """Return True if value is a colon-separated MAC such as 28:D2:5A:A1:29:6E."""
+    if len(value) != 17:
+        return False
+    raw = value.encode("ascii", "ignore")
+    if len(raw) != 17:
+        return False
+    for i in _MAC_COLON_POSITIONS:
+        if raw[i] != 0x3A:  # ':'
+            return False
+    for i in _MAC_HEX_POSITIONS:
+        if raw[i] not in _HEX_DIGITS:
+            return False
+    return True
 
 
 def validate_config() -> None:
@@ -61,15 +88,13 @@ def validate_config() -> None:
     Validate configuration integrity before starting the system.
     Ensures proper MAC format and logical threshold order.
     """
-    import re
-
     # Validate MAC format for required phone MAC
-    if not re.match(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$", PHONE_MAC):
+    if not _is_mac(PHONE_MAC):
         raise ValueError(f"Invalid PHONE_MAC format: {PHONE_MAC}")
 
     # Validate optional headphone MAC if provided
     if HEADPHONE_MAC:
-        if not re.match(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$", HEADPHONE_MAC):
+        if not _is_mac(HEADPHONE_MAC):
             raise ValueError(f"Invalid HEADPHONE_MAC format: {HEADPHONE_MAC}")
 
     # Validate thresholds
@@ -77,6 +102,16 @@ def validate_config() -> None:
         raise ValueError(
             f"LOCK_THRESHOLD ({LOCK_THRESHOLD}) must be less than UNLOCK_THRESHOLD ({UNLOCK_THRESHOLD})"
         )
+    if LOCK_MARGIN < 0 or UNLOCK_MARGIN < 0:
+        raise ValueError(
+            f"LOCK_MARGIN ({LOCK_MARGIN}) and UNLOCK_MARGIN ({UNLOCK_MARGIN}) must not be negative"
+        )
+
+    # Validate smoothing weight
+    if not 0.0 < RSSI_EMA_ALPHA <= 1.0:
+        raise ValueError(
+            f"RSSI_EMA_ALPHA ({RSSI_EMA_ALPHA}) must be in (0, 1]"
+        )
 
     # Create log folder if it doesn’t exist
     LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -8,25 +8,49 @@ Author: Professional Development Team
 Version: 1.0.2
 """
 
-import atexit
-from datetime import datetime
-from typing import Optional
-from enum import Enum
+import os
+import sys
+import time
+import traceback
+import weakref
+from typing import Optional, Union
+from enum import IntEnum
 from pathlib import Path
 import config_module as config
 
 
-class EventType(Enum):
-    """Enumeration of loggable event types."""
-    SYSTEM_START = "SYSTEM_START"
-    SYSTEM_STOP = "SYSTEM_STOP"
-    PHONE_DETECTED = "PHONE_DETECTED"
-    PHONE_NOT_DETECTED = "PHONE_NOT_DETECTED"
-    SYSTEM_LOCKED = "SYSTEM_LOCKED"
-    SYSTEM_UNLOCKED = "SYSTEM_UNLOCKED"
-    ERROR = "ERROR"
-    WARNING = "WARNING"
-    INFO = "INFO"
+class EventType(IntEnum):
+    """Enumeration of loggable event types (indexes into _LABELS/_COLORS)."""
+    SYSTEM_START = 0
+    SYSTEM_STOP = 1
+    PHONE_DETECTED = 2
+    PHONE_NOT_DETECTED = 3
+    SYSTEM_LOCKED = 4
+    SYSTEM_UNLOCKED = 5
+    ERROR = 6
+    WARNING = 7
+    INFO = 8
+
+
+# Per-EventType log labels and console colors, indexed by int(event_type)
+_LABELS = tuple(event_type.name for event_type in EventType)
+_RESET = "\033[0m"
+_COLORS = (
+    "\033[97m",  # SYSTEM_START: White
+    "\033[97m",  # SYSTEM_STOP: White
+    "\033[97m",  # PHONE_DETECTED: White
+    "\033[97m",  # PHONE_NOT_DETECTED: White
+    "\033[95m",  # SYSTEM_LOCKED: Magenta
+    "\033[92m",  # SYSTEM_UNLOCKED: Green
+    "\033[91m",  # ERROR: Red
+    "\033[93m",  # WARNING: Yellow
+    "\033[96m",  # INFO: Cyan
+)
+
+# Log line template; the trailing newline is part of the entry
+_LINE_FMT = "[%s] [%s] %s | %s\n"
+_RSSI_NA = "RSSI: N/A"
+_STOP_MESSAGE = "Bluetooth Proximity Lock system stopped"
 
 
 class EventLogger:
@@ -38,10 +62,18 @@ class EventLogger:
     def __init__(self, log_file: Path = config.LOG_FILE, verbose: bool = config.VERBOSE_LOGGING):
         self.log_file = Path(log_file)
         self.verbose = verbose
+        # Skip ANSI escapes when console output is redirected
+        self._color = sys.stdout is not None and sys.stdout.isatty()
+        # Last formatted second, reused for bursts of entries within it
+        self._ts_sec = -1
+        self._ts_str = ""
         self._ensure_log_directory()
+        self._fd = self._open_log_file()
         self._log_session_start()
-        # Ensure system stop is logged on exit
-        atexit.register(self.log_system_stop)
+        # Ensure system stop is logged on exit (or when the logger is
+        # collected) without atexit holding a reference to the logger
+        self._finalizer = weakref.finalize(
+            self, EventLogger._emit_stop, self._fd, self.verbose, self._color)
 
     # =========================================================================
     # INTERNAL METHODS
@@ -56,40 +88,67 @@ class EventLogger:
         except Exception as e:
             print(f"[WARNING] Could not initialize log file: {e}")
 
+    def _open_log_file(self) -> Optional[int]:
+        """Open the log file once as a raw append-only descriptor."""
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        try:
+            return os.open(self.log_file, flags, 0o644)
+        except Exception as e:
+            print(f"[WARNING] Could not open log file: {e}")
+            return None
+
+    @staticmethod
+    def _emit_stop(fd: Optional[int], verbose: bool, color: bool):
+        """
+        Write the SYSTEM_STOP entry and close the log file.
+
+        Runs as the logger's finalizer, so it must not reference the logger.
+        """
+        entry = _LINE_FMT % (time.strftime("%Y-%m-%d %H:%M:%S"),
+                             _LABELS[EventType.SYSTEM_STOP], _STOP_MESSAGE, _RSSI_NA)
+        if fd is not None:
+            try:
+                os.write(fd, entry.encode("utf-8", "replace"))
+            except Exception as e:
+                print(f"[ERROR] Failed to write log entry: {e}")
+            finally:
+                os.close(fd)
+        if verbose:
+            if color:
+                entry = _COLORS[EventType.SYSTEM_STOP] + entry + _RESET
+            print(entry, end="")
+
     def _format_timestamp(self) -> str:
-        """Generate formatted timestamp."""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        """Generate formatted timestamp, reformatting at most once per second."""
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_str = time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._ts_sec = sec
+        return self._ts_str
 
     def _format_log_entry(self, event_type: EventType, message: str, rssi: Optional[int]) -> str:
-        """Create a structured log entry."""
-        timestamp = self._format_timestamp()
-        rssi_str = f"RSSI: {rssi} dBm" if rssi is not None else "RSSI: N/A"
-        return f"[{timestamp}] [{event_type.value}] {message} | {rssi_str}"
+        """Create a structured, newline-terminated log entry."""
+        rssi_str = _RSSI_NA if rssi is None else "RSSI: %d dBm" % rssi
+        return _LINE_FMT % (self._format_timestamp(), _LABELS[event_type], message, rssi_str)
 
     def _write_log_entry(self, event_type: EventType, message: str, rssi: Optional[int]):
         """Write log entry to file and optionally to console."""
         entry = self._format_log_entry(event_type, message, rssi)
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(entry + "\n")
+            if self._fd is not None:
+                os.write(self._fd, entry.encode("utf-8", "replace"))
         except Exception as e:
             print(f"[ERROR] Failed to write log entry: {e}")
 
         if self.verbose:
-            print(self._colorize_console(entry, event_type))
+            print(self._colorize_console(entry, event_type), end="")
 
     def _colorize_console(self, text: str, event_type: EventType) -> str:
         """Add color to console output for clarity."""
-        colors = {
-            EventType.ERROR: "\033[91m",    # Red
-            EventType.WARNING: "\033[93m",  # Yellow
-            EventType.INFO: "\033[96m",     # Cyan
-            EventType.SYSTEM_LOCKED: "\033[95m",  # Magenta
-            EventType.SYSTEM_UNLOCKED: "\033[92m",  # Green
-        }
-        reset = "\033[0m"
-        color = colors.get(event_type, "\033[97m")
-        return f"{color}{text}{reset}"
+        if not self._color:
+            return text
+        return _COLORS[event_type] + text + _RESET
 
     # =========================================================================
     # PUBLIC LOGGING METHODS
@@ -100,8 +159,9 @@ class EventLogger:
                               "Bluetooth Proximity Lock system started", None)
 
     def log_system_stop(self):
-        self._write_log_entry(EventType.SYSTEM_STOP,
-                              "Bluetooth Proximity Lock system stopped", None)
+        """Log system stop and close the log file; later calls are no-ops."""
+        self._fd = None
+        self._finalizer()
 
     def log_phone_detected(self, rssi: int):
         self._write_log_entry(EventType.PHONE_DETECTED,
@@ -119,7 +179,16 @@ class EventLogger:
         self._write_log_entry(EventType.SYSTEM_UNLOCKED,
                               "System unlocked (device nearby)", rssi)
 
-    def log_error(self, message: str, rssi: Optional[int] = None):
+    def log_error(self, message: str, rssi: Optional[int] = None,
+                  exc_info: Union[bool, BaseException] = False):
+        """
+        Log an error. As with the logging module, exc_info=True (inside an
+        except block) or an exception instance appends its traceback.
+        """
+        if exc_info:
+            exc = sys.exc_info()[1] if exc_info is True else exc_info
+            if exc is not None:
+                message = f"{message}: {''.join(traceback.format_exception(exc))}"
         self._write_log_entry(EventType.ERROR, message, rssi)
 
     def log_warning(self, message: str, rssi: Optional[int] = None):
@@ -8,11 +8,11 @@ Version: 1.0.3 (Fixed Imports & Runtime + Robust RSSI Handling)
 """
 
 import asyncio
+import functools
 import time
 import sys
-import traceback
 import inspect
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 # Correct imports based on your filenames
 import config_module as config
@@ -20,16 +20,23 @@ import logger_module as logger_module
 import system_control_module as system_control_module
 import bluetooth_scanner_module as bt_module
 
+# Optional module APIs, resolved once at import
+_VALIDATE = getattr(config, "validate_config", None)
+_BLUETOOTH_CLS = getattr(bt_module, "BluetoothScanner", None)
+
+
+def _no_statistics() -> dict:
+    return {}
+
 
 class ProximityLockController:
     """Main controller coordinating scanning + locking with hysteresis."""
 
     def __init__(self):
         # Validate configuration
-        validator = getattr(config, "validate_config", None)
-        if callable(validator):
+        if callable(_VALIDATE):
             try:
-                validator()
+                _VALIDATE()
             except Exception as e:
                 print(f"[CONFIG ERROR] {e}")
                 sys.exit(1)
@@ -37,128 +44,120 @@ class ProximityLockController:
         # Initialize components
         self.logger = logger_module.get_logger()
         self.system_controller = system_control_module.get_controller()
+        self._get_stats = getattr(
+            self.system_controller, "get_statistics", _no_statistics)
         self.scanner = None
 
         # Attempt to initialize Bluetooth scanner
-        if hasattr(bt_module, "BluetoothScanner"):
+        if _BLUETOOTH_CLS is not None:
             try:
-                self.scanner = bt_module.BluetoothScanner(
+                self.scanner = _BLUETOOTH_CLS(
                     target_mac=config.PHONE_MAC,
                     scan_timeout=getattr(config, "SCAN_TIMEOUT", 3.0)
                 )
             except Exception as e:
                 self.logger.log_warning(f"BluetoothScanner init failed: {e}")
 
+        # Resolve the RSSI API once instead of probing on every scan
+        self._rssi_call = self._resolve_rssi_call()
+
         # State variables
         self.is_locked = False
         self.consecutive_failures = 0
+        self._ema: Optional[float] = None
         self.scan_count = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
 
         # Banner
         self._print_startup_banner()
 
     # -------------------------------------------------------------------------
     def _print_startup_banner(self):
-        print("\n" + "=" * 70)
-        print(" BLUETOOTH PROXIMITY LOCK SYSTEM")
-        print("=" * 70)
-        print(f"Target Device: {config.PHONE_MAC}")
-        print(f"Lock Threshold: {config.LOCK_THRESHOLD} dBm")
-        print(f"Unlock Threshold: {config.UNLOCK_THRESHOLD} dBm")
-        print(f"Scan Interval: {config.SCAN_INTERVAL} seconds")
+        lines = [
+            "",
+            "=" * 70,
+            " BLUETOOTH PROXIMITY LOCK SYSTEM",
+            "=" * 70,
+            f"Target Device: {config.PHONE_MAC}",
+            f"Lock Threshold: {config.LOCK_THRESHOLD} dBm",
+            f"Unlock Threshold: {config.UNLOCK_THRESHOLD} dBm",
+            f"Scan Interval: {config.SCAN_INTERVAL} seconds",
+        ]
         try:
-            print(f"Log File: {self.logger.get_log_path()}")
+            lines.append(f"Log File: {self.logger.get_log_path()}")
         except Exception:
             pass
-        print("=" * 70)
-        print("\nPress Ctrl+C to stop the system.\n")
+        lines += ["=" * 70, "", "Press Ctrl+C to stop the system.", "", ""]
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
 
     # -------------------------------------------------------------------------
-    async def _get_rssi(self) -> Optional[int]:
-        """Attempt to retrieve RSSI using available APIs."""
-        self.scan_count += 1
+    def _resolve_rssi_call(self) -> Optional[Callable[[], Awaitable[Optional[int]]]]:
+        """Pick the first available scanner API and bind it as a zero-arg coroutine."""
+        candidates = []
+        # 1) Instance-level methods
+        if self.scanner is not None:
+            for name in ("get_rssi", "get_device_rssi", "scan_once"):
+                candidates.append(getattr(self.scanner, name, None))
+        # 2) Module-level functions
+        for name in ("scan_for_device", "get_device_rssi", "get_rssi", "discover_once"):
+            candidates.append(getattr(bt_module, name, None))
+
+        for meth in candidates:
+            if meth:
+                return self._bind_rssi_call(meth)
+        return None
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _bind_rssi_call(meth) -> Callable[[], Awaitable[Optional[int]]]:
+        """Wrap a scanner callable, passing the MAC if it takes an argument."""
         try:
-            # 1) Try instance-level methods
-            if self.scanner is not None:
-                for name in ("get_rssi", "get_device_rssi", "scan_once"):
-                    meth = getattr(self.scanner, name, None)
-                    if meth:
-                        sig = None
-                        try:
-                            sig = inspect.signature(meth)
-                        except Exception:
-                            pass
-
-                        needs_mac = False
-                        if sig is not None:
-                            # Exclude 'self' if present
-                            params = [
-                                p for p in sig.parameters.values() if p.name != 'self']
-                            needs_mac = len(params) >= 1
-
-                        if inspect.iscoroutinefunction(meth):
-                            if needs_mac:
-                                return await meth(config.PHONE_MAC)
-                            return await meth()
-                        else:
-                            loop = asyncio.get_running_loop()
-                            if needs_mac:
-                                return await loop.run_in_executor(None, meth, config.PHONE_MAC)
-                            return await loop.run_in_executor(None, meth)
-
-            # 2) Try module-level async functions
-            if hasattr(bt_module, "scan_for_device"):
-                meth = getattr(bt_module, "scan_for_device")
-                sig = None
-                try:
-                    sig = inspect.signature(meth)
-                except Exception:
-                    pass
-
-                needs_mac = False
-                if sig is not None:
-                    params = list(sig.parameters.values())
-                    needs_mac = len(params) >= 1
-
-                if inspect.iscoroutinefunction(meth):
-                    if needs_mac:
-                        return await meth(config.PHONE_MAC)
-                    return await meth()
-                else:
-                    loop = asyncio.get_running_loop()
-                    if needs_mac:
-                        return await loop.run_in_executor(None, meth, config.PHONE_MAC)
-                    return await loop.run_in_executor(None, meth)
-
-            # 3) Try module-level sync functions
-            for name in ("get_device_rssi", "get_rssi", "discover_once"):
-                meth = getattr(bt_module, name, None)
-                if meth:
-                    sig = None
-                    try:
-                        sig = inspect.signature(meth)
-                    except Exception:
-                        pass
-
-                    needs_mac = False
-                    if sig is not None:
-                        params = list(sig.parameters.values())
-                        needs_mac = len(params) >= 1
-
-                    loop = asyncio.get_running_loop()
-                    if needs_mac:
-                        return await loop.run_in_executor(None, meth, config.PHONE_MAC)
-                    return await loop.run_in_executor(None, meth)
+            needs_mac = len(inspect.signature(meth).parameters) >= 1
+        except (TypeError, ValueError):
+            needs_mac = False
+        args = (config.PHONE_MAC,) if needs_mac else ()
+
+        if inspect.iscoroutinefunction(meth):
+            return functools.partial(meth, *args)
+
+        async def _call_in_executor() -> Optional[int]:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, meth, *args)
+        return _call_in_executor
 
+    # -------------------------------------------------------------------------
+    async def _get_rssi(self) -> Optional[int]:
+        """
+        Retrieve RSSI using the scanner API resolved at startup.
+
+        Never raises: any scan failure is logged and reported as None.
+        """
+        self.scan_count += 1
+
+        if self._rssi_call is None:
             self.logger.log_warning("No usable Bluetooth scanner API found.")
             return None
 
+        try:
+            return await self._rssi_call()
         except Exception as e:
             self.logger.log_warning(f"RSSI read failed: {e}")
             return None  # <-- safely handle any scan failure
 
+    # -------------------------------------------------------------------------
+    def _smooth_rssi(self, rssi: Optional[int]) -> Optional[int]:
+        """Fold a reading into the RSSI moving average; None resets it."""
+        if rssi is None:
+            self._ema = None
+            return None
+        if self._ema is None:
+            self._ema = float(rssi)
+        else:
+            alpha = config.RSSI_EMA_ALPHA
+            self._ema = alpha * rssi + (1.0 - alpha) * self._ema
+        return round(self._ema)
+
     # -------------------------------------------------------------------------
     def _should_lock(self, rssi: Optional[int]) -> bool:
         """Determine if system should lock."""
@@ -188,14 +187,22 @@ class ProximityLockController:
     # -------------------------------------------------------------------------
     async def monitor_loop(self):
         """Main monitoring loop."""
+        await self._start_scanner()
         try:
             while True:
-                rssi = None
-                try:
-                    rssi = await self._get_rssi()
-                except Exception as e:
-                    self.logger.log_warning(f"RSSI scan exception: {e}")
-                    rssi = None
+                rssi = await self._get_rssi()
+
+                # Right after the scan starts no advertisement has arrived
+                # yet; that is not a miss, so wait for the first reading
+                if rssi is None and getattr(self.scanner, "awaiting_first_reading", False):
+                    await self._wait_for_next_scan()
+                    continue
+
+                # Decide on the smoothed signal to avoid flapping on noise.
+                # The continuous scanner averages every advertisement itself;
+                # polled readings are averaged here once per SCAN_INTERVAL.
+                if not getattr(self.scanner, "is_running", False):
+                    rssi = self._smooth_rssi(rssi)
 
                 if not self.is_locked:
                     if self._should_lock(rssi):
@@ -210,25 +217,69 @@ class ProximityLockController:
                             self.is_locked = False
                             self.logger.log_system_unlocked(rssi)
 
-                await asyncio.sleep(config.SCAN_INTERVAL)
+                await self._wait_for_next_scan()
 
         except asyncio.CancelledError:
             pass
         except KeyboardInterrupt:
             pass
         except Exception as e:
-            tb = ''.join(traceback.format_exception(None, e, e.__traceback__))
-            self.logger.log_error(f"Fatal error: {tb}")
+            self.logger.log_error("Fatal error", exc_info=e)
             raise
+        finally:
+            await self._stop_scanner()
+
+    # -------------------------------------------------------------------------
+    async def _wait_for_next_scan(self):
+        """
+        Wait until the next evaluation.
+
+        With continuous scanning, wake as soon as the RSSI crosses a threshold
+        or the reading goes stale, and at least every SCAN_INTERVAL so missed
+        scans keep counting towards a lock; otherwise poll every
+        SCAN_INTERVAL.
+        """
+        if not getattr(self.scanner, "is_running", False):
+            await asyncio.sleep(config.SCAN_INTERVAL)
+            return
+
+        event = self.scanner.adv_event
+        timeout = min(config.SCAN_INTERVAL, config.MAX_STALE_S)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    # -------------------------------------------------------------------------
+    async def _start_scanner(self):
+        """Start continuous scanning; polling is used if this fails."""
+        if self.scanner is None or not hasattr(self.scanner, "start"):
+            return
+        try:
+            await self.scanner.start()
+        except Exception as e:
+            self.logger.log_warning(
+                f"Continuous scan unavailable, falling back to polling: {e}")
+
+    # -------------------------------------------------------------------------
+    async def _stop_scanner(self):
+        """Stop continuous scanning if it was started."""
+        if self.scanner is None or not hasattr(self.scanner, "stop"):
+            return
+        try:
+            await self.scanner.stop()
+        except Exception as e:
+            self.logger.log_warning(f"Scanner stop failed: {e}")
 
     # -------------------------------------------------------------------------
     def _shutdown(self):
         """Print summary and log shutdown."""
-        uptime = int(time.time() - self.start_time)
+        uptime = int(time.monotonic() - self.start_time)
         hrs, rem = divmod(uptime, 3600)
         mins, secs = divmod(rem, 60)
 
-        stats = getattr(self.system_controller, "get_statistics", lambda: {})()
+        stats = self._get_stats()
         self.logger.log_system_stop()
 
         print("\n=== SHUTTING DOWN ===")
@@ -240,19 +291,27 @@ class ProximityLockController:
 
 
 # -------------------------------------------------------------------------
+def _loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's loop factory when installed, else the asyncio default."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def run():
     controller = ProximityLockController()
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     try:
-        loop.run_until_complete(controller.monitor_loop())
+        with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+            runner.run(controller.monitor_loop())
     except KeyboardInterrupt:
-        controller._shutdown()
+        pass
     except Exception as e:
         controller.logger.log_error(f"Unhandled exception: {e}")
-        controller._shutdown()
-    finally:
-        loop.close()
+    # The runner cancels monitor_loop on Ctrl+C, which may then return
+    # normally, so always print the summary
+    controller._shutdown()
 
 
 if __name__ == "__main__":
@@ -12,20 +12,25 @@ Design goals:
 - Clear, PEP8-compliant code under 500 lines
 """
 
+import array
 import asyncio
 import sys
 import os
 import time
+import traceback
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import config_module as config
 import logger_module as logger_module
 import system_control_module as system_control_module
 import bluetooth_scanner_module as bt_module
 
+_RULE = "=" * 70
+_SCANNER_RETRY_INTERVAL = 30.0  # Seconds between restart attempts of a failed scanner
 
-@dataclass
+
+@dataclass(slots=True)
 class TargetDevice:
     """Represents a target BLE device configuration and runtime state."""
 
@@ -33,13 +38,22 @@ class TargetDevice:
     mac: str
     lock_threshold: int
     unlock_threshold: int
-    scanner: Optional[bt_module.BluetoothScanner] = None
-    consecutive_failures: int = 0
+    # Hysteresis: extra dB the smoothed signal must pass a threshold by
+    lock_margin: int = 0
+    unlock_margin: int = 0
 
 
 class ProximityLockController:
     """Main controller coordinating multi-device scanning and lock/unlock."""
 
+    __slots__ = (
+        "logger", "system_controller", "devices", "is_locked", "scan_count",
+        "start_time", "_scan_interval", "_verbose", "_fail_threshold",
+        "_rssi_log_delta", "_last_logged_rssi", "_rssi_changed",
+        "_device_names", "_fail_counts", "_scanner", "_scanner_failed",
+        "_scanner_retry_at", "_rssi_map", "_pending",
+    )
+
     def __init__(self):
         # Validate configuration if available
         validator = getattr(config, "validate_config", None)
@@ -49,12 +63,34 @@ class ProximityLockController:
         self.logger = logger_module.get_logger()
         self.system_controller = system_control_module.get_controller()
 
-        self.devices: List[TargetDevice] = self._load_devices_from_config()
-        self._init_scanners()
+        # Snapshot tunables once; the monitor loop reads these attributes
+        self._scan_interval: float = float(getattr(config, "SCAN_INTERVAL", 5.0))
+        self._verbose: bool = bool(getattr(config, "VERBOSE_LOGGING", True))
+        self._fail_threshold: int = int(
+            getattr(config, "CONSECUTIVE_FAIL_THRESHOLD", 2))
+        self._rssi_log_delta: int = int(getattr(config, "RSSI_LOG_DELTA", 3))
+
+        # RSSI last written to the log per device, and devices whose reading
+        # moved enough this cycle to be logged again
+        self._last_logged_rssi: Dict[str, Optional[int]] = {}
+        self._rssi_changed: Set[str] = set()
+
+        self.devices: Tuple[TargetDevice, ...] = tuple(
+            self._load_devices_from_config())
+        self._device_names: Tuple[str, ...] = tuple(d.name for d in self.devices)
+        # Per-cycle readings, reused across cycles (see _scan_all)
+        self._rssi_map: Dict[str, Optional[int]] = dict.fromkeys(self._device_names)
+        # Devices not heard yet since the scan started; not counted as misses
+        self._pending: Set[str] = set()
+        # Consecutive misses per device, indexed like devices
+        self._fail_counts = array.array("l", [0] * len(self.devices))
+        self._scanner: Optional[bt_module.MultiDeviceScanner] = self._init_scanner()
+        self._scanner_failed: bool = False
+        self._scanner_retry_at: float = 0.0
 
         self.is_locked: bool = False
         self.scan_count: int = 0
-        self.start_time: float = time.time()
+        self.start_time: float = time.monotonic()
 
         self._print_startup_banner()
 
@@ -72,6 +108,8 @@ class ProximityLockController:
                 mac=config.PHONE_MAC,
                 lock_threshold=config.LOCK_THRESHOLD,
                 unlock_threshold=config.UNLOCK_THRESHOLD,
+                lock_margin=config.LOCK_MARGIN,
+                unlock_margin=config.UNLOCK_MARGIN,
             )
         )
 
@@ -83,101 +121,120 @@ class ProximityLockController:
                     mac=headphone_mac,
                     lock_threshold=config.LOCK_THRESHOLD,
                     unlock_threshold=config.UNLOCK_THRESHOLD,
+                    lock_margin=config.LOCK_MARGIN,
+                    unlock_margin=config.UNLOCK_MARGIN,
                 )
             )
 
         return devices
 
     # ------------------------------------------------------------------
-    def _init_scanners(self) -> None:
-        """Initialize per-device scanners using the existing module."""
-        for device in self.devices:
-            try:
-                device.scanner = bt_module.BluetoothScanner(
-                    target_mac=device.mac, scan_timeout=getattr(
-                        config, "SCAN_TIMEOUT", 3.0)
-                )
-            except Exception as e:
-                self.logger.log_warning(
-                    f"Scanner init failed for {device.name}: {e}")
-                device.scanner = None
+    def _init_scanner(self) -> Optional[bt_module.MultiDeviceScanner]:
+        """Create one scanner shared by all target devices."""
+        try:
+            return bt_module.MultiDeviceScanner(d.mac for d in self.devices)
+        except Exception as e:
+            self.logger.log_warning(f"Scanner init failed: {e}")
+            return None
 
     # ------------------------------------------------------------------
     def _print_startup_banner(self) -> None:
-        print("\n" + "=" * 70)
-        print(" BLUETOOTH PROXIMITY LOCK SYSTEM (Multi-Device)")
-        print("=" * 70)
-        for d in self.devices:
-            print(
-                f"Target: {d.name} | MAC: {d.mac} | L:{d.lock_threshold} / U:{d.unlock_threshold}")
-        print(
-            f"Scan Interval: {getattr(config, 'SCAN_INTERVAL', 5.0)} seconds")
+        lines = [
+            "",
+            _RULE,
+            " BLUETOOTH PROXIMITY LOCK SYSTEM (Multi-Device)",
+            _RULE,
+            *(f"Target: {d.name} | MAC: {d.mac} | "
+              f"L:{d.lock_threshold - d.lock_margin} / U:{d.unlock_threshold + d.unlock_margin}"
+              for d in self.devices),
+            f"Scan Interval: {self._scan_interval} seconds",
+        ]
         try:
-            print(f"Log File: {self.logger.get_log_path()}")
+            lines.append(f"Log File: {self.logger.get_log_path()}")
         except Exception:
             pass
-        print("=" * 70)
-        print("\nPress Ctrl+C to stop the system.\n")
+        lines += [_RULE, "", "Press Ctrl+C to stop the system.", "", ""]
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
 
     # ------------------------------------------------------------------
-    async def _scan_device(self, device: TargetDevice) -> Optional[int]:
-        """Scan a single device asynchronously, returning RSSI or None."""
-        try:
-            if device.scanner is None:
-                return None
-
-            get_rssi = getattr(device.scanner, "get_rssi", None)
-            if get_rssi is None:
-                return None
+    def _scan_all(self) -> Dict[str, Optional[int]]:
+        """Return each device's smoothed RSSI (None if unseen or stale).
 
-            if asyncio.iscoroutinefunction(get_rssi):
-                return await get_rssi()
-
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, get_rssi)
-
-        except Exception as e:
-            self.logger.log_warning(f"RSSI read failed for {device.name}: {e}")
-            return None
+        The same dict is refilled every cycle; callers must not keep it.
+        Devices the scanner has not had time to hear yet go in _pending.
+        """
+        rssi_map = self._rssi_map
+        pending = self._pending
+        pending.clear()
+        scanner = self._scanner
+        for device in self.devices:
+            rssi = None
+            if scanner is not None:
+                rssi = scanner.get_rssi(device.mac)
+                if rssi is None and scanner.awaiting_first_reading(device.mac):
+                    pending.add(device.name)
+            rssi_map[device.name] = rssi
+        return rssi_map
 
     # ------------------------------------------------------------------
-    async def _scan_all(self) -> Dict[str, Optional[int]]:
-        """Scan all devices concurrently and return per-device RSSI results."""
-        tasks = [self._scan_device(d) for d in self.devices]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        rssi_map: Dict[str, Optional[int]] = {}
-        for device, result in zip(self.devices, results):
-            if isinstance(result, Exception):
-                self.logger.log_warning(
-                    f"Scan exception for {device.name}: {result!r}")
-                rssi_map[device.name] = None
-            else:
-                rssi_map[device.name] = result
-        return rssi_map
+    def _update_rssi_changed(self, rssi_map: Dict[str, Optional[int]]) -> None:
+        """Record which devices' RSSI moved enough since last logged.
+
+        A device counts as changed on first reading, when it appears or
+        disappears, or when RSSI moved by at least RSSI_LOG_DELTA dB.
+        """
+        changed = self._rssi_changed
+        changed.clear()
+        last_logged = self._last_logged_rssi
+        delta = self._rssi_log_delta
+        pending = self._pending
+        for name in self._device_names:
+            if name in pending:
+                continue
+            rssi = rssi_map.get(name)
+            if name in last_logged:
+                prev = last_logged[name]
+                if rssi is None or prev is None:
+                    if (rssi is None) == (prev is None):
+                        continue
+                elif abs(rssi - prev) < delta:
+                    continue
+            last_logged[name] = rssi
+            changed.add(name)
 
     # ------------------------------------------------------------------
-    def _evaluate_lock(self, rssi_map: Dict[str, Optional[int]]) -> bool:
-        """Return True to lock if any device is out of range per rules."""
-        should_lock = False
-        for device in self.devices:
+    def _update_failure_counters(self, rssi_map: Dict[str, Optional[int]]) -> None:
+        """Track consecutive misses per device and log detection changes."""
+        fail_counts = self._fail_counts
+        fail_threshold = self._fail_threshold
+        for i, device in enumerate(self.devices):
             rssi = rssi_map.get(device.name)
-
             if rssi is None:
-                device.consecutive_failures += 1
-                if device.consecutive_failures >= getattr(
-                    config, "CONSECUTIVE_FAIL_THRESHOLD", 2
-                ):
+                if device.name in self._pending:
+                    continue
+                fail_counts[i] += 1
+                if fail_counts[i] == fail_threshold:
                     self.logger.log_phone_not_detected()
-                    should_lock = True
                 continue
 
-            device.consecutive_failures = 0
-            self.logger.log_phone_detected(rssi)
-            if rssi < device.lock_threshold:
-                should_lock = True
+            fail_counts[i] = 0
+            if device.name in self._rssi_changed:
+                self.logger.log_phone_detected(rssi)
 
-        return should_lock
+    # ------------------------------------------------------------------
+    def _evaluate_lock(self, rssi_map: Dict[str, Optional[int]]) -> bool:
+        """Return True as soon as any device is out of range per rules."""
+        fail_counts = self._fail_counts
+        fail_threshold = self._fail_threshold
+        for i, device in enumerate(self.devices):
+            rssi = rssi_map.get(device.name)
+            if rssi is None:
+                if fail_counts[i] >= fail_threshold:
+                    return True
+            elif rssi < device.lock_threshold - device.lock_margin:
+                return True
+        return False
 
     # ------------------------------------------------------------------
     def _evaluate_unlock(self, rssi_map: Dict[str, Optional[int]]) -> bool:
@@ -186,29 +243,46 @@ class ProximityLockController:
             rssi = rssi_map.get(device.name)
             if rssi is None:
                 continue
-            if rssi > device.unlock_threshold:
-                self.logger.log_phone_detected(rssi)
+            if rssi > device.unlock_threshold + device.unlock_margin:
                 return True
         return False
 
     # ------------------------------------------------------------------
     async def monitor_loop(self) -> None:
-        """Main monitoring loop: scan, decide, and act every interval."""
+        """Main monitoring loop: read latest RSSI, decide, and act every interval.
+
+        One scanner runs continuously in the background for all devices, so
+        each iteration reads cached readings instead of waiting for a
+        discovery. If the scanner is down, a restart is attempted at most
+        every _SCANNER_RETRY_INTERVAL seconds (see _start_scanner).
+        """
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time() + self._scan_interval
         try:
             while True:
                 self.scan_count += 1
-                rssi_map = await self._scan_all()
+                await self._start_scanner()
+                # Readings are averaged per advertisement by the scanner,
+                # so decisions use the smoothed signal to avoid flapping
+                rssi_map = self._scan_all()
+                self._update_rssi_changed(rssi_map)
 
-                # Log per-device RSSI
+                # Log per-device RSSI, only when it changed noticeably
                 for device in self.devices:
+                    if device.name not in self._rssi_changed:
+                        continue
                     rssi = rssi_map.get(device.name)
                     # informational logs only when verbose, avoid blocking
-                    if getattr(config, "VERBOSE_LOGGING", True):
+                    if self._verbose:
                         msg = (
                             f"{device.name} RSSI: {rssi if rssi is not None else 'N/A'}"
                         )
                         self.logger.log_info(msg)
 
+                # Miss counters update in every state; the lock check below
+                # can then stop at the first out-of-range device
+                self._update_failure_counters(rssi_map)
+
                 if not self.is_locked:
                     if self._evaluate_lock(rssi_map):
                         ok = self.system_controller.lock_system()
@@ -225,7 +299,14 @@ class ProximityLockController:
                             self.logger.log_system_unlocked(
                                 rssi_map.get("phone"))
 
-                await asyncio.sleep(getattr(config, "SCAN_INTERVAL", 5.0))
+                # Fixed-period cadence: sleep only the remainder of this
+                # interval, resyncing if we fell more than a period behind
+                delay = next_deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -self._scan_interval:
+                    next_deadline = loop.time()
+                next_deadline += self._scan_interval
 
         except asyncio.CancelledError:
             pass
@@ -233,33 +314,71 @@ class ProximityLockController:
             pass
         except Exception as e:
             # Log full traceback to aid diagnosis
-            import traceback as _tb
-
-            tb_str = "".join(_tb.format_exception(None, e, e.__traceback__))
-            self.logger.log_error(f"Fatal error: {tb_str}")
+            self.logger.log_error("Fatal error", exc_info=e)
             raise
+        finally:
+            await self._stop_scanner()
+
+    # ------------------------------------------------------------------
+    async def _start_scanner(self) -> None:
+        """Start the shared scanner if it is not running yet.
+
+        After a failed start, retries are spaced _SCANNER_RETRY_INTERVAL apart
+        and the warning is logged once until the scanner comes back.
+        """
+        scanner = self._scanner
+        if scanner is None or scanner.is_running:
+            return
+        now = time.monotonic()
+        if now < self._scanner_retry_at:
+            return
+        try:
+            await scanner.start()
+        except Exception as e:
+            if not self._scanner_failed:
+                self.logger.log_warning(
+                    f"Bluetooth scan could not start, retrying every "
+                    f"{_SCANNER_RETRY_INTERVAL:.0f}s: {e}")
+            self._scanner_failed = True
+            self._scanner_retry_at = now + _SCANNER_RETRY_INTERVAL
+            return
+        if self._scanner_failed:
+            self.logger.log_info("Bluetooth scan started")
+            self._scanner_failed = False
+
+    # ------------------------------------------------------------------
+    async def _stop_scanner(self) -> None:
+        """Stop the shared scanner."""
+        if self._scanner is None:
+            return
+        try:
+            await self._scanner.stop()
+        except Exception as e:
+            self.logger.log_warning(f"Scanner stop failed: {e}")
 
     # ------------------------------------------------------------------
     def shutdown(self) -> None:
         """Print summary and log shutdown."""
-        uptime = int(time.time() - self.start_time)
+        uptime = int(time.monotonic() - self.start_time)
         hrs, rem = divmod(uptime, 3600)
         mins, secs = divmod(rem, 60)
         stats = getattr(self.system_controller, "get_statistics", lambda: {})()
 
         self.logger.log_system_stop()
-        print("\n=== SHUTTING DOWN ===")
-        print(f"Uptime: {hrs}h {mins}m {secs}s")
-        print(f"Total scans: {self.scan_count}")
-        print(
-            f"Locks: {stats.get('total_locks', 'N/A')} | Unlocks: {stats.get('total_unlocks', 'N/A')}"
+        sys.stdout.write(
+            "\n=== SHUTTING DOWN ===\n"
+            f"Uptime: {hrs}h {mins}m {secs}s\n"
+            f"Total scans: {self.scan_count}\n"
+            f"Locks: {stats.get('total_locks', 'N/A')} | Unlocks: {stats.get('total_unlocks', 'N/A')}\n"
+            "[EXIT] System stopped gracefully.\n\n"
         )
-        print("[EXIT] System stopped gracefully.\n")
+        sys.stdout.flush()
 
 
 def run() -> None:
-    # Ensure Bleak works reliably on Windows
-    if sys.platform == "win32":
+    # Bleak's WinRT backend works with the default Proactor loop; the
+    # Selector loop is only used when explicitly requested
+    if sys.platform == "win32" and os.environ.get("FORCE_SELECTOR_LOOP"):
         try:
             asyncio.set_event_loop_policy(
                 asyncio.WindowsSelectorEventLoopPolicy())
@@ -267,18 +386,16 @@ def run() -> None:
             pass
 
     controller = ProximityLockController()
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     try:
-        loop.run_until_complete(controller.monitor_loop())
-    except KeyboardInterrupt:
+        try:
+            asyncio.run(controller.monitor_loop())
+        except KeyboardInterrupt:
+            pass
+        # Ctrl+C cancels monitor_loop, which then returns normally
         controller.shutdown()
     except Exception as e:
         # Print traceback to console for visibility when double-clicked
-        import traceback as _tb
-
-        tb_str = "".join(_tb.format_exception(None, e, e.__traceback__))
-        print("\n[UNHANDLED EXCEPTION]\n" + tb_str)
+        print("\n[UNHANDLED EXCEPTION]\n" + "".join(traceback.format_exception(e)))
         controller.logger.log_error(f"Unhandled exception: {e}")
         controller.shutdown()
         # Pause on exit unless disabled
@@ -288,7 +405,6 @@ def run() -> None:
             except Exception:
                 pass
     finally:
-        loop.close()
         # If the loop ended without KeyboardInterrupt, keep console open briefly
         if not os.environ.get("NO_PAUSE_ON_EXIT"):
             try:
@@ -2,24 +2,35 @@
 System Control Module
 =====================
 Handles Windows system operations including screen locking and wake simulation.
-Uses Windows API calls through ctypes and os modules.
+Uses Windows API calls through ctypes.
 
 Platform: Windows 10/11
 Author: Professional Development Team
 Version: 1.0.0
 """
 
-import os
 import sys
 import ctypes
-from typing import Optional
 from enum import Enum
 
 import config_module as config
 
+# Windows API entry points, resolved once at import
+if sys.platform == "win32":
+    from ctypes import wintypes
 
-class SystemState(Enum):
-    """Enumeration of possible system states."""
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _LockWorkStation = _user32.LockWorkStation
+    _LockWorkStation.argtypes = []
+    _LockWorkStation.restype = wintypes.BOOL
+    _mouse_event = _user32.mouse_event
+else:
+    _LockWorkStation = None
+    _mouse_event = None
+
+
+class SystemState(str, Enum):
+    """Enumeration of possible system states (members compare equal to their strings)."""
     LOCKED = "locked"
     UNLOCKED = "unlocked"
     UNKNOWN = "unknown"
@@ -62,16 +73,14 @@ class WindowsSystemController:
                 print("[ACTION] Executing system lock...")
             
             # Call Windows API to lock workstation
-            result = os.system("rundll32.exe user32.dll,LockWorkStation")
-            
-            if result == 0:
+            if _LockWorkStation():
                 self.current_state = SystemState.LOCKED
                 self.lock_count += 1
                 if config.VERBOSE_LOGGING:
                     print(f"[SUCCESS] System locked (Total locks: {self.lock_count})")
                 return True
             else:
-                print(f"[WARNING] Lock command returned non-zero status: {result}")
+                print(f"[WARNING] LockWorkStation failed (error {ctypes.get_last_error()})")
                 return False
                 
         except Exception as e:
@@ -95,7 +104,7 @@ class WindowsSystemController:
             
             # MOUSEEVENTF_MOVE with no delta = simulated activity without visible cursor movement
             # This keeps the system awake and can turn on the display
-            ctypes.windll.user32.mouse_event(0x0001, 0, 0, 0, 0)
+            _mouse_event(0x0001, 0, 0, 0, 0)
             
             self.current_state = SystemState.UNLOCKED
             self.unlock_count += 1
@@ -136,7 +145,7 @@ class WindowsSystemController:
 # ============================================================================
 
 # Global controller instance
-_controller: Optional[WindowsSystemController] = None
+_controller: WindowsSystemController | None = None
 
 
 def get_controller() -> WindowsSystemController:
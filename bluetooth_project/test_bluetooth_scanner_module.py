@@ -0,0 +1,131 @@
+"""
+Tests for the continuous scanners in bluetooth_scanner_module.
+
+Run from this folder with:  python -m unittest
+"""
+
+import asyncio
+import sys
+import types
+import unittest
+from unittest import mock
+
+try:
+    import bleak  # noqa: F401
+except ImportError:
+    # The scanners are exercised against StubScanner below; a placeholder
+    # package is enough to import the module without bleak installed
+    _bleak = types.ModuleType("bleak")
+    _bleak.BleakScanner = None
+    _bleak_exc = types.ModuleType("bleak.exc")
+    _bleak_exc.BleakError = type("BleakError", (Exception,), {})
+    _bleak.exc = _bleak_exc
+    sys.modules["bleak"] = _bleak
+    sys.modules["bleak.exc"] = _bleak_exc
+
+import bluetooth_scanner_module as bt_module
+
+
+class StubScanner:
+    """Stands in for BleakScanner and records start/stop calls."""
+
+    def __init__(self, detection_callback=None, **kwargs):
+        self.detection_callback = detection_callback
+        self.started = False
+        self.stopped = False
+
+    async def start(self):
+        self.started = True
+
+    async def stop(self):
+        self.stopped = True
+
+
+class ContinuousScannerTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(bt_module, "BleakScanner", StubScanner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _start_and_stop(self, scanner):
+        async def run():
+            await scanner.start()
+            self.assertTrue(scanner.is_running)
+            stub = scanner._scanner
+            self.assertTrue(stub.started)
+            await scanner.stop()
+            self.assertFalse(scanner.is_running)
+            return stub
+        return asyncio.run(run())
+
+    def test_bluetooth_scanner_start_stop(self):
+        stub = self._start_and_stop(bt_module.BluetoothScanner("AA:BB:CC:DD:EE:FF"))
+        self.assertTrue(stub.stopped)
+
+    def test_multi_device_scanner_start_stop(self):
+        stub = self._start_and_stop(
+            bt_module.MultiDeviceScanner(["AA:BB:CC:DD:EE:FF", "11:22:33:44:55:66"]))
+        self.assertTrue(stub.stopped)
+
+    def test_stale_timer_fires_after_last_advertisement(self):
+        scanner = bt_module.BluetoothScanner("AA:BB:CC:DD:EE:FF")
+        scanner.stale_timeout = 0.05
+        device = types.SimpleNamespace(address="AA:BB:CC:DD:EE:FF")
+        adv = types.SimpleNamespace(rssi=-60)
+
+        async def run():
+            await scanner.start()
+            scanner._on_advertisement(device, adv)
+            # Keep advertising past the first expiry; the timer re-arms
+            for _ in range(3):
+                await asyncio.sleep(0.03)
+                scanner.adv_event.clear()
+                scanner._on_advertisement(device, adv)
+            self.assertFalse(scanner.adv_event.is_set())
+            await asyncio.wait_for(scanner.adv_event.wait(), timeout=1.0)
+            self.assertIsNone(await scanner.get_rssi())
+            await scanner.stop()
+        asyncio.run(run())
+
+    def test_never_seen_is_stale_shortly_after_boot(self):
+        scanner = bt_module.BluetoothScanner("AA:BB:CC:DD:EE:FF")
+        device = types.SimpleNamespace(address="AA:BB:CC:DD:EE:FF")
+
+        async def run():
+            await scanner.start()
+            with mock.patch.object(bt_module.time, "monotonic", return_value=1.0):
+                self.assertIsNone(await scanner.get_rssi())
+                scanner._on_advertisement(device, types.SimpleNamespace(rssi=-60))
+                self.assertEqual(await scanner.get_rssi(), -60)
+            await scanner.stop()
+        asyncio.run(run())
+
+    def test_awaiting_first_reading_until_heard_or_stale(self):
+        mac = "AA:BB:CC:DD:EE:FF"
+        single = bt_module.BluetoothScanner(mac)
+        multi = bt_module.MultiDeviceScanner([mac], stale_timeout=0.05)
+        single.stale_timeout = 0.05
+        device = types.SimpleNamespace(address=mac)
+        adv = types.SimpleNamespace(rssi=-60)
+
+        async def run():
+            self.assertFalse(single.awaiting_first_reading)
+            self.assertFalse(multi.awaiting_first_reading(mac))
+            await single.start()
+            await multi.start()
+            self.assertTrue(single.awaiting_first_reading)
+            self.assertTrue(multi.awaiting_first_reading(mac))
+            # Heard: a later None is a real miss
+            single._on_advertisement(device, adv)
+            self.assertFalse(single.awaiting_first_reading)
+            # Never heard: the grace period ends after stale_timeout
+            await asyncio.sleep(0.06)
+            self.assertFalse(multi.awaiting_first_reading(mac))
+            await single.stop()
+            await multi.stop()
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()